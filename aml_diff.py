@@ -0,0 +1,33 @@
+import argparse
+import json
+
+from lib.db_diff import ENTITIES, diff_databases
+
+
+def format_value(value):
+    if isinstance(value, dict):
+        return json.dumps(value)
+
+    return "" if value is None else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show the changes between two AML databases."
+    )
+    parser.add_argument("old", help="Database of the previous export")
+    parser.add_argument("new", help="Database of the current export")
+    parser.add_argument(
+        "--entity",
+        action="append",
+        choices=[*ENTITIES, "Attr"],
+        help="Limit the diff to an entity, can be repeated",
+    )
+    args = parser.parse_args()
+
+    for change in diff_databases(args.old, args.new, args.entity):
+        print("\t".join(format_value(value) for value in change))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,38 @@
 import os.path
 
-from sqlalchemy import func
-from sqlmodel import Session, col, create_engine, select
+from sqlmodel import Session, SQLModel, create_engine, select
 
-from lib.db_datamodel import CxnDef, CxnOcc, Group, Model, ObjDef, ObjOcc
-from lib.parser import AMLParser
+from lib.db_datamodel import CxnDef, CxnOcc, Group, Model, ObjDef, ObjOcc, Stat
+from lib.db_utilities import create_statistics, is_current_schema
+from lib.memory_datamodel import MemoryDatabase
+from lib.parser import AMLParser, get_sqlite_filename
 
 
 class AMLQuery:
-    def __init__(self, aml_filename: str, force_parse: bool = False):
+    def __init__(
+        self, aml_filename: str, force_parse: bool = False, in_memory: bool = False
+    ):
+        """
+        With in_memory the export is always parsed and queried as linked Python
+        objects (lib.memory_datamodel) instead of through a SQLite database.
+        """
+
         if not os.path.exists(aml_filename):
             raise SystemExit(f"Error: No valid AML filename provided.")
 
-        sqlite_filename = f"{os.path.splitext(aml_filename)[0]}.db"
+        self.in_memory = in_memory
+        if in_memory:
+            parser = AMLParser(aml_filename, in_memory=True)
+            self.engine = None
+            self.__memory_db = MemoryDatabase(parser.data)
+            return
+
+        sqlite_filename = get_sqlite_filename(aml_filename)
         if not os.path.exists(sqlite_filename) or force_parse:
             AMLParser(aml_filename)
+        elif not is_current_schema(sqlite_filename):
+            print(f"Database '{sqlite_filename}' uses an older schema.")
+            AMLParser(aml_filename)
 
         if not os.path.exists(sqlite_filename):
             raise SystemExit(f"Error: Could not create database {sqlite_filename}.")
@@ -25,6 +43,11 @@ class AMLQuery:
 
         self.__session = Session(self.engine)
 
+        # Databases created before the statistics table existed get it built once
+        SQLModel.metadata.create_all(self.engine, tables=[Stat.__table__])
+        if self.__session.exec(select(Stat.id).limit(1)).first() is None:
+            create_statistics(self.__session)
+
     def get_assigned_fad(self, item: ObjDef | ObjOcc) -> Model | None:
         """
         Returns the FAD for this object definition
@@ -67,7 +90,21 @@ class AMLQuery:
         if direction not in ["in", "out", "both"]:
             direction = "out"
 
-        if direction in ["in", "both"]:
+        if direction in ["in", "both"] and self.in_memory:
+            in_connected_occs = list(
+                dict.fromkeys(
+                    cxn.obj_occ
+                    for cxn in obj_occ.in_cxns
+                    if (cxn.type in cxn_types if cxn_types is not None else True)
+                    and (
+                        cxn.obj_occ.symbol in symbol_types
+                        if symbol_types is not None
+                        else True
+                    )
+                )
+            )
+
+        elif direction in ["in", "both"]:
             in_connected_occs = []
 
             for occ in obj_occ.model.occs:
@@ -119,6 +156,11 @@ class AMLQuery:
         Retrieve a model matching guid
         """
 
+        if self.in_memory:
+            return next(
+                (m for m in self.__memory_db.models.values() if m.guid == guid), None
+            )
+
         statement = select(Model).where(Model.guid == guid)
 
         return self.__session.exec(statement).one_or_none()
@@ -131,6 +173,9 @@ class AMLQuery:
         Retrieve a model matching aris_id
         """
 
+        if self.in_memory:
+            return self.__memory_db.models.get(aris_id)
+
         statement = select(Model).where(Model.aris_id == aris_id)
 
         return self.__session.exec(statement).one_or_none()
@@ -142,6 +187,9 @@ class AMLQuery:
         Retrieve groups.
         """
 
+        if self.in_memory:
+            return list(self.__memory_db.groups.values())
+
         return self.__session.exec(select(Group))
 
     def get_models(
@@ -156,6 +204,15 @@ class AMLQuery:
             model_types = (
                 model_types if isinstance(model_types, list) else [model_types]
             )
+
+        if self.in_memory:
+            return [
+                model
+                for model in self.__memory_db.models.values()
+                if model_types is None or model.type in model_types
+            ]
+
+        if model_types is not None:
             statement = select(Model).where(Model.type.in_(model_types))
         else:
             statement = select(Model)
@@ -182,19 +239,31 @@ class AMLQuery:
 
         return [occ for occ in occs if occ.symbol in symbol_types]
 
-    def db_stats(self) -> dict:
-        stats = {
-            "groups": Group,
-            "cxn_defs": CxnDef,
-            "obj_defs": ObjDef,
-            "cxn_occs": CxnOcc,
-            "obj_occ": ObjOcc,
-            "models": Model,
-        }
-
-        for obj_type, db_type in stats.items():
-            stats[obj_type] = self.__session.exec(
-                select(func.count(col(db_type.id)))
-            ).one()
+    def stats(self, categories: list[str] | str = None) -> dict:
+        """
+        Return the statistics materialized at import time, keyed by category
+        ("totals", "model_types", "occ_symbols", "cxn_types", "occs_per_model").
+        """
+
+        if categories is not None:
+            categories = categories if isinstance(categories, list) else [categories]
+
+        if self.in_memory:
+            stats = self.__memory_db.stats()
+            if categories is None:
+                return stats
+
+            return {category: stats.get(category, {}) for category in categories}
+
+        statement = select(Stat)
+        if categories is not None:
+            statement = statement.where(Stat.category.in_(categories))
+
+        stats = {category: {} for category in categories or []}
+        for stat in self.__session.exec(statement):
+            stats.setdefault(stat.category, {})[stat.key] = stat.value
 
         return stats
+
+    def db_stats(self) -> dict:
+        return self.stats("totals")["totals"]
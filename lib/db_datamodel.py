@@ -1,10 +1,148 @@
-from pydantic import ConfigDict
-from sqlmodel import Field, Relationship, SQLModel
+from functools import cache
 
+from pydantic import ConfigDict, model_serializer
+from sqlalchemy import event
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlmodel import Field, Relationship, Session, SQLModel, select
+
+
+class Code(SQLModel, table=True):
+    """
+    Lookup table for the low-cardinality strings (types, symbols and attribute
+    names) which the other tables store as integer codes.
+    """
 
-class Attr(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
-    name: str
+    value: str = Field(unique=True)
+
+
+class CodeComparator(Comparator):
+    """
+    Compares a code column against strings by resolving them to code ids once,
+    e.g. `Model.type == "MT_EEPC"` becomes
+    `model.type_id IN (SELECT id FROM code WHERE value = 'MT_EEPC')`.
+    Selecting the property itself still returns the string.
+    """
+
+    def __init__(self, code_id):
+        self.code_id = code_id
+        super().__init__(select(Code.value).where(Code.id == code_id).scalar_subquery())
+
+    def operate(self, op, *other, **kwargs):
+        codes = select(Code.id).where(op(Code.value, *other, **kwargs))
+        return self.code_id.in_(codes)
+
+
+def coded(name: str) -> hybrid_property:
+    """
+    String view of the `<name>_id` code column. Works on instances as well as in
+    queries, e.g. `select(Model).where(Model.type == "MT_FUNC_ALLOC_DGM")`.
+    """
+
+    def fget(self):
+        code = getattr(self, f"{name}_code")
+        return code.value if code is not None else None
+
+    def fset(self, value):
+        # Duplicates of existing codes are merged by merge_new_codes on flush
+        setattr(self, f"{name}_code", Code(value=value))
+
+    def comparator(cls):
+        return CodeComparator(getattr(cls, f"{name}_id"))
+
+    return hybrid_property(fget, fset, custom_comparator=comparator)
+
+
+def code_relationship(column: str):
+    return Relationship(
+        sa_relationship_kwargs={"foreign_keys": column, "lazy": "joined"}
+    )
+
+
+@cache
+def coded_names(cls) -> tuple[str, ...]:
+    return tuple(
+        name for name, attr in vars(cls).items() if isinstance(attr, hybrid_property)
+    )
+
+
+class CodedMixin:
+    """
+    Lets the coded columns be given as strings, both as constructor arguments
+    and by assignment. Must come before SQLModel in the bases.
+    """
+
+    def __init__(self, **data):
+        values = {
+            name: data.pop(name) for name in coded_names(type(self)) if name in data
+        }
+        super().__init__(**data)
+
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        if name in coded_names(type(self)):
+            vars(type(self))[name].__set__(self, value)
+        else:
+            super().__setattr__(name, value)
+
+    def __repr_args__(self):
+        yield from super().__repr_args__()
+
+        for name in coded_names(type(self)):
+            # Only codes already loaded, repr shouldn't hit the database
+            code = self.__dict__.get(f"{name}_code")
+            yield name, code.value if code is not None else None
+
+    @model_serializer(mode="wrap")
+    def serialize_codes(self, handler):
+        data = handler(self)
+        for name in coded_names(type(self)):
+            data[name] = getattr(self, name)
+
+        return data
+
+
+@event.listens_for(Session, "before_flush")
+def merge_new_codes(session, flush_context, instances):
+    """
+    Replace pending Code rows whose value already exists, in the database or
+    earlier in the same flush, so each value is stored once.
+    """
+
+    new_codes = [obj for obj in session.new if isinstance(obj, Code)]
+    if not new_codes:
+        return
+
+    with session.no_autoflush:
+        statement = select(Code).where(Code.value.in_({c.value for c in new_codes}))
+        canonical = {code.value: code for code in session.scalars(statement)}
+
+    duplicates = {}
+    for code in new_codes:
+        if canonical.setdefault(code.value, code) is not code:
+            duplicates[id(code)] = (code, canonical[code.value])
+
+    if not duplicates:
+        return
+
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, CodedMixin):
+            for name in coded_names(type(obj)):
+                code = obj.__dict__.get(f"{name}_code")
+                if id(code) in duplicates:
+                    setattr(obj, f"{name}_code", duplicates[id(code)][1])
+
+    for code, _ in duplicates.values():
+        session.expunge(code)
+
+
+class Attr(CodedMixin, SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name_id: int = Field(foreign_key="code.id", index=True)
+    name_code: Code = code_relationship("Attr.name_id")
+    name = coded("name")
     value: str
     group_id: int | None = Field(default=None, foreign_key="group.id")
     cxn_def_id: int | None = Field(default=None, foreign_key="cxndef.id")
@@ -12,7 +150,9 @@ class Attr(SQLModel, table=True):
     model_id: int | None = Field(default=None, foreign_key="model.id")
 
     # Because we want to use model_id
-    model_config = ConfigDict(protected_namespaces=("protect_ns_",))
+    model_config = ConfigDict(
+        protected_namespaces=("protect_ns_",), ignored_types=(hybrid_property,)
+    )
 
     def __repr__(self) -> str:
         return f"{self.name}={self.value}"
@@ -58,11 +198,14 @@ class Group(SQLModel, AttrMixin, table=True):
         return (len(self.models) + len(self.groups)) > 0
 
 
-class CxnDef(SQLModel, AttrMixin, table=True):
+class CxnDef(CodedMixin, SQLModel, AttrMixin, table=True):
     id: int = Field(default=None, primary_key=True)
     aris_id: str
     guid: str
-    type: str
+
+    type_id: int = Field(foreign_key="code.id", index=True)
+    type_code: Code = code_relationship("CxnDef.type_id")
+    type = coded("type")
 
     connected_to_id: int = Field(foreign_key="objdef.id")
     connected_to: "ObjDef" = Relationship(
@@ -75,16 +218,24 @@ class CxnDef(SQLModel, AttrMixin, table=True):
     attrs: list[Attr] | None = Relationship()
     aris_type: str = Field(default="CxnDef")
 
+    model_config = ConfigDict(ignored_types=(hybrid_property,))
+
 
-class ObjDef(SQLModel, AttrMixin, table=True):
+class ObjDef(CodedMixin, SQLModel, AttrMixin, table=True):
     id: int = Field(default=None, primary_key=True)
     aris_id: str
     guid: str
     name: str
-    type: str
-    symbol: str
     path: str
 
+    type_id: int = Field(foreign_key="code.id", index=True)
+    type_code: Code = code_relationship("ObjDef.type_id")
+    type = coded("type")
+
+    symbol_id: int = Field(foreign_key="code.id", index=True)
+    symbol_code: Code = code_relationship("ObjDef.symbol_id")
+    symbol = coded("symbol")
+
     parent_id: int = Field(foreign_key="group.id")
     parent: Group = Relationship(back_populates="obj_defs")
 
@@ -99,15 +250,20 @@ class ObjDef(SQLModel, AttrMixin, table=True):
 
     aris_type: str = Field(default="ObjDef")
 
+    model_config = ConfigDict(ignored_types=(hybrid_property,))
+
 
-class Model(SQLModel, AttrMixin, table=True):
+class Model(CodedMixin, SQLModel, AttrMixin, table=True):
     id: int = Field(default=None, primary_key=True)
     aris_id: str
     guid: str
     name: str
-    type: str
     path: str
 
+    type_id: int = Field(foreign_key="code.id", index=True)
+    type_code: Code = code_relationship("Model.type_id")
+    type = coded("type")
+
     seperior_def_id: int | None = Field(foreign_key="objdef.id")
     superior_def: ObjDef | None = Relationship(back_populates="linked_models")
 
@@ -119,6 +275,8 @@ class Model(SQLModel, AttrMixin, table=True):
 
     aris_type: str = Field(default="Model")
 
+    model_config = ConfigDict(ignored_types=(hybrid_property,))
+
 
 class CxnOcc(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
@@ -143,10 +301,12 @@ class CxnOcc(SQLModel, table=True):
         return self.cxn_def.type
 
 
-class ObjOcc(SQLModel, table=True):
+class ObjOcc(CodedMixin, SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     aris_id: str
-    symbol: str
+    symbol_id: int = Field(foreign_key="code.id", index=True)
+    symbol_code: Code = code_relationship("ObjOcc.symbol_id")
+    symbol = coded("symbol")
     derived_symbol: str | None = Field(default=None)
     x: int = Field(default=0)
     y: int = Field(default=0)
@@ -166,7 +326,9 @@ class ObjOcc(SQLModel, table=True):
     aris_type: str = Field(default="ObjOcc")
 
     # Because we want to use model_id
-    model_config = ConfigDict(protected_namespaces=("protect_ns_",))
+    model_config = ConfigDict(
+        protected_namespaces=("protect_ns_",), ignored_types=(hybrid_property,)
+    )
 
     @property
     def name(self) -> str:
@@ -174,3 +336,10 @@ class ObjOcc(SQLModel, table=True):
         Returns the name of the occurance from the object definition.
         """
         return self.obj_def.name
+
+
+class Stat(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    category: str = Field(index=True)
+    key: str
+    value: int
@@ -0,0 +1,206 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+
+class Change(NamedTuple):
+    entity: str
+    kind: str
+    key: str
+    field: str | None
+    old: str | dict | None
+    new: str | dict | None
+
+
+# Per entity: the key used to match rows across the two databases and the
+# compared fields, selected from the schema named {db}. Codes and foreign keys
+# are resolved to strings and guids, as ids differ between databases.
+ENTITIES = {
+    "Group": """
+        SELECT coalesce(g.guid, g.aris_id) AS key, g.name,
+            coalesce(p.guid, p.aris_id) AS parent
+        FROM {db}."group" g
+        LEFT JOIN {db}."group" p ON g.parent_id = p.id
+    """,
+    "ObjDef": """
+        SELECT o.guid AS key, o.name, t.value AS type, s.value AS symbol,
+            coalesce(p.guid, p.aris_id) AS parent
+        FROM {db}.objdef o
+        JOIN {db}.code t ON o.type_id = t.id
+        JOIN {db}.code s ON o.symbol_id = s.id
+        LEFT JOIN {db}."group" p ON o.parent_id = p.id
+    """,
+    "Model": """
+        SELECT m.guid AS key, m.name, t.value AS type,
+            coalesce(p.guid, p.aris_id) AS parent
+        FROM {db}.model m
+        JOIN {db}.code t ON m.type_id = t.id
+        LEFT JOIN {db}."group" p ON m.parent_id = p.id
+    """,
+    "CxnDef": """
+        SELECT c.guid AS key, t.value AS type, s.guid AS source,
+            d.guid AS target
+        FROM {db}.cxndef c
+        JOIN {db}.code t ON c.type_id = t.id
+        LEFT JOIN {db}.objdef s ON c.obj_def_id = s.id
+        LEFT JOIN {db}.objdef d ON c.connected_to_id = d.id
+    """,
+    "ObjOcc": """
+        SELECT o.aris_id AS key, s.value AS symbol, d.guid AS obj_def,
+            m.guid AS model
+        FROM {db}.objocc o
+        JOIN {db}.code s ON o.symbol_id = s.id
+        LEFT JOIN {db}.objdef d ON o.obj_def_id = d.id
+        LEFT JOIN {db}.model m ON o.model_id = m.id
+    """,
+    "CxnOcc": """
+        SELECT c.aris_id AS key, d.guid AS cxn_def, s.aris_id AS source,
+            t.aris_id AS target
+        FROM {db}.cxnocc c
+        LEFT JOIN {db}.cxndef d ON c.cxn_def_id = d.id
+        LEFT JOIN {db}.objocc s ON c.obj_occ_id = s.id
+        LEFT JOIN {db}.objocc t ON c.connected_to_id = t.id
+    """,
+}
+
+# Attributes are keyed on their owner and name, e.g. ("ObjDef:<guid>", "AT_DESC")
+ATTRS = """
+    SELECT 'Group:' || coalesce(o.guid, o.aris_id) AS key, n.value AS name,
+        a.value
+    FROM {db}.attr a
+    JOIN {db}."group" o ON a.group_id = o.id
+    JOIN {db}.code n ON a.name_id = n.id
+    UNION ALL
+    SELECT 'ObjDef:' || o.guid, n.value, a.value
+    FROM {db}.attr a
+    JOIN {db}.objdef o ON a.obj_def_id = o.id
+    JOIN {db}.code n ON a.name_id = n.id
+    UNION ALL
+    SELECT 'Model:' || o.guid, n.value, a.value
+    FROM {db}.attr a
+    JOIN {db}.model o ON a.model_id = o.id
+    JOIN {db}.code n ON a.name_id = n.id
+    UNION ALL
+    SELECT 'CxnDef:' || o.guid, n.value, a.value
+    FROM {db}.attr a
+    JOIN {db}.cxndef o ON a.cxn_def_id = o.id
+    JOIN {db}.code n ON a.name_id = n.id
+"""
+
+# Paths are derived from names and parents, so they aren't compared
+FIELD_KINDS = {"name": "renamed", "parent": "moved"}
+
+
+def open_read_only(sqlite_filename):
+    if not Path(sqlite_filename).exists():
+        raise SystemExit(f"Error: Database '{sqlite_filename}' does not exist.")
+
+    return f"{Path(sqlite_filename).absolute().as_uri()}?mode=ro"
+
+
+def create_snapshot(connection, db, table, query):
+    """
+    Materialize one side of an entity into an indexed temp table.
+    """
+
+    connection.execute(f"CREATE TEMP TABLE {table} AS {query.format(db=db)}")
+    connection.execute(f"CREATE INDEX temp.{table}_key ON {table} (key)")
+
+
+def diff_entity(connection, entity) -> Iterator[Change]:
+    old_table, new_table = f"old_{entity.lower()}", f"new_{entity.lower()}"
+    fields = [
+        row[1]
+        for row in connection.execute(f"PRAGMA temp.table_info({new_table})")
+        if row[1] != "key"
+    ]
+
+    for kind, source, other, side in (
+        ("removed", old_table, new_table, "old"),
+        ("added", new_table, old_table, "new"),
+    ):
+        cursor = connection.execute(f"""
+            SELECT s.* FROM {source} s
+            LEFT JOIN {other} o ON s.key = o.key
+            WHERE o.key IS NULL
+            """)
+        for key, *values in cursor:
+            values = dict(zip(fields, values))
+            if side == "old":
+                yield Change(entity, kind, key, None, values, None)
+            else:
+                yield Change(entity, kind, key, None, None, values)
+
+    for field in fields:
+        cursor = connection.execute(f"""
+            SELECT o.key, o.{field}, n.{field} FROM {old_table} o
+            JOIN {new_table} n ON o.key = n.key
+            WHERE o.{field} IS NOT n.{field}
+            """)
+        kind = FIELD_KINDS.get(field, "changed")
+        for key, old, new in cursor:
+            yield Change(entity, kind, key, field, old, new)
+
+
+def diff_attrs(connection) -> Iterator[Change]:
+    for kind, source, other, side in (
+        ("removed", "old_attr", "new_attr", "old"),
+        ("added", "new_attr", "old_attr", "new"),
+    ):
+        cursor = connection.execute(f"""
+            SELECT s.key, s.name, s.value FROM {source} s
+            LEFT JOIN {other} o ON s.key = o.key AND s.name = o.name
+            WHERE o.key IS NULL
+            """)
+        for key, name, value in cursor:
+            if side == "old":
+                yield Change("Attr", kind, key, name, value, None)
+            else:
+                yield Change("Attr", kind, key, name, None, value)
+
+    cursor = connection.execute("""
+        SELECT o.key, o.name, o.value, n.value FROM old_attr o
+        JOIN new_attr n ON o.key = n.key AND o.name = n.name
+        WHERE o.value IS NOT n.value
+        """)
+    for key, name, old, new in cursor:
+        yield Change("Attr", "changed", key, name, old, new)
+
+
+def diff_databases(
+    old_filename: str,
+    new_filename: str,
+    entities: list[str] | str = None,
+) -> Iterator[Change]:
+    """
+    Stream the changes between two AML databases, optionally limited to some
+    entities ("Group", "ObjDef", "Model", "CxnDef", "ObjOcc", "CxnOcc", "Attr").
+    Definitions and models are matched on guid, occurances on aris_id.
+    """
+
+    if entities is not None:
+        entities = entities if isinstance(entities, list) else [entities]
+        entities = list(dict.fromkeys(entities))
+    else:
+        entities = [*ENTITIES, "Attr"]
+
+    for entity in entities:
+        if entity not in ENTITIES and entity != "Attr":
+            raise SystemExit(f"Error: Unknown entity '{entity}'.")
+
+    connection = sqlite3.connect(open_read_only(new_filename), uri=True)
+    try:
+        connection.execute("ATTACH DATABASE ? AS old", (open_read_only(old_filename),))
+
+        for entity in entities:
+            query = ATTRS if entity == "Attr" else ENTITIES[entity]
+            for db, side in (("old", "old"), ("main", "new")):
+                create_snapshot(connection, db, f"{side}_{entity.lower()}", query)
+
+        for entity in entities:
+            if entity == "Attr":
+                yield from diff_attrs(connection)
+            else:
+                yield from diff_entity(connection, entity)
+    finally:
+        connection.close()
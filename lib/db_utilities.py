@@ -2,14 +2,46 @@ import copy
 import os
 from functools import partial
 
-from sqlmodel import Session, SQLModel, create_engine
-
-from lib.db_datamodel import Attr, CxnDef, CxnOcc, Group, Model, ObjDef, ObjOcc
-
-
-def create_group(group):
+from sqlalchemy import func, inspect
+from sqlmodel import Session, SQLModel, col, create_engine, delete, select
+
+from lib.db_datamodel import (
+    Attr,
+    Code,
+    CxnDef,
+    CxnOcc,
+    Group,
+    Model,
+    ObjDef,
+    ObjOcc,
+    Stat,
+)
+
+TOTALS = {
+    "groups": Group,
+    "cxn_defs": CxnDef,
+    "obj_defs": ObjDef,
+    "cxn_occs": CxnOcc,
+    "obj_occ": ObjOcc,
+    "models": Model,
+}
+
+
+def get_code(codes, value):
+    """
+    Return the shared Code row for a type, symbol or attribute name string.
+    """
+
+    if value not in codes:
+        codes[value] = Code(value=value)
+
+    return codes[value]
+
+
+def create_group(codes, group):
     attrs = [
-        Attr(name=name, value=value) for name, value in group.get("attrs", {}).items()
+        Attr(name_code=get_code(codes, name), value=value)
+        for name, value in group.get("attrs", {}).items()
     ]
 
     return Group(
@@ -22,22 +54,24 @@ def create_group(group):
     )
 
 
-def create_cxn_def(cxn_def):
+def create_cxn_def(codes, cxn_def):
     attrs = [
-        Attr(name=name, value=value) for name, value in cxn_def.get("attrs", {}).items()
+        Attr(name_code=get_code(codes, name), value=value)
+        for name, value in cxn_def.get("attrs", {}).items()
     ]
 
     return CxnDef(
         aris_id=cxn_def["aris_id"],
         guid=cxn_def["guid"],
-        type=cxn_def["type"],
+        type_code=get_code(codes, cxn_def["type"]),
         attrs=attrs,
     )
 
 
-def create_obj_def(db_data, obj_def):
+def create_obj_def(codes, db_data, obj_def):
     attrs = [
-        Attr(name=name, value=value) for name, value in obj_def.get("attrs", {}).items()
+        Attr(name_code=get_code(codes, name), value=value)
+        for name, value in obj_def.get("attrs", {}).items()
     ]
 
     cxns = [db_data[cxn_id] for cxn_id in obj_def.get("cxns", [])]
@@ -47,8 +81,8 @@ def create_obj_def(db_data, obj_def):
         parent=db_data[obj_def["parent"]],
         guid=obj_def["guid"],
         name=obj_def["name"],
-        type=obj_def["type"],
-        symbol=obj_def["symbol"],
+        type_code=get_code(codes, obj_def["type"]),
+        symbol_code=get_code(codes, obj_def["symbol"]),
         cxns=cxns,
         attrs=attrs,
         path=obj_def["path"],
@@ -62,10 +96,10 @@ def create_cxn_occ(db_data, cxn_occ):
     )
 
 
-def create_obj_occ(db_data, obj_occ):
+def create_obj_occ(codes, db_data, obj_occ):
     return ObjOcc(
         aris_id=obj_occ["aris_id"],
-        symbol=obj_occ["symbol"],
+        symbol_code=get_code(codes, obj_occ["symbol"]),
         derived_symbol=obj_occ.get("derived_symbol"),
         x=obj_occ["x"],
         y=obj_occ["y"],
@@ -77,9 +111,10 @@ def create_obj_occ(db_data, obj_occ):
     )
 
 
-def create_model(db_data, model):
+def create_model(codes, db_data, model):
     attrs = [
-        Attr(name=name, value=value) for name, value in model.get("attrs", {}).items()
+        Attr(name_code=get_code(codes, name), value=value)
+        for name, value in model.get("attrs", {}).items()
     ]
 
     db_model = Model(
@@ -87,7 +122,7 @@ def create_model(db_data, model):
         parent=db_data[model["parent"]],
         guid=model["guid"],
         name=model["name"],
-        type=model["type"],
+        type_code=get_code(codes, model["type"]),
         attrs=attrs,
         path=model["path"],
     )
@@ -130,6 +165,73 @@ def add_obj_occs_to_model(db_data, data):
         db_data[model_id].occs = [db_data[occ_id] for occ_id in model.get("occs", [])]
 
 
+def create_statistics(session):
+    """
+    (Re)build the Stat table from the current contents of the database.
+    """
+
+    session.exec(delete(Stat))
+
+    stats = []
+
+    for obj_type, db_type in TOTALS.items():
+        count = session.exec(select(func.count(col(db_type.id)))).one()
+        stats.append(Stat(category="totals", key=obj_type, value=count))
+
+    histograms = (
+        (
+            "model_types",
+            select(Code.value, func.count(col(Model.id)))
+            .join(Model, Model.type_id == Code.id)
+            .group_by(Code.id),
+        ),
+        (
+            "occ_symbols",
+            select(Code.value, func.count(col(ObjOcc.id)))
+            .join(ObjOcc, ObjOcc.symbol_id == Code.id)
+            .group_by(Code.id),
+        ),
+        (
+            "cxn_types",
+            select(Code.value, func.count(col(CxnDef.id)))
+            .join(CxnDef, CxnDef.type_id == Code.id)
+            .group_by(Code.id),
+        ),
+        (
+            "occs_per_model",
+            select(Model.aris_id, func.count(col(ObjOcc.id)))
+            .join(ObjOcc, isouter=True)
+            .group_by(Model.id),
+        ),
+    )
+
+    for category, statement in histograms:
+        for key, count in session.exec(statement):
+            stats.append(Stat(category=category, key=key, value=count))
+
+    session.add_all(stats)
+    session.commit()
+
+
+def is_current_schema(sqlite_filename):
+    """
+    Returns False for databases created before types, symbols and attribute
+    names were stored as codes, which have to be parsed again.
+    """
+
+    engine = create_engine(f"sqlite:///{sqlite_filename}", echo=False)
+    try:
+        inspector = inspect(engine)
+        if not inspector.has_table("code"):
+            return False
+
+        return "type_id" in {
+            column["name"] for column in inspector.get_columns("model")
+        }
+    finally:
+        engine.dispose()
+
+
 def create_database(data, sqlite_filename):
     sqlite_url = f"sqlite:///{sqlite_filename}"
 
@@ -140,14 +242,15 @@ def create_database(data, sqlite_filename):
     SQLModel.metadata.create_all(engine)
 
     db_data = {}
+    codes = {}
 
     type_and_func = (
-        ("groups", create_group),
-        ("cxn_defs", create_cxn_def),
-        ("obj_defs", partial(create_obj_def, db_data)),
-        ("models", partial(create_model, db_data)),
+        ("groups", partial(create_group, codes)),
+        ("cxn_defs", partial(create_cxn_def, codes)),
+        ("obj_defs", partial(create_obj_def, codes, db_data)),
+        ("models", partial(create_model, codes, db_data)),
         ("cxn_occs", partial(create_cxn_occ, db_data)),
-        ("obj_occs", partial(create_obj_occ, db_data)),
+        ("obj_occs", partial(create_obj_occ, codes, db_data)),
     )
 
     with Session(engine) as session:
@@ -165,3 +268,5 @@ def create_database(data, sqlite_filename):
         link_superior_defs_to_models(db_data, data)
 
         session.commit()
+
+        create_statistics(session)
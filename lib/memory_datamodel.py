@@ -0,0 +1,318 @@
+from collections import Counter
+
+
+class Attr:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"{self.name}={self.value}"
+
+
+class AttrMixin:
+    """
+    Attributes are kept as the parser's {name: value} dict, Attr objects are
+    only created when the attrs list is asked for.
+    """
+
+    __slots__ = ()
+
+    @property
+    def attrs(self) -> list[Attr]:
+        return [Attr(name, value) for name, value in self._attrs.items()]
+
+    def get_attr(self, attr_name):
+        return self._attrs.get(attr_name)
+
+    def attrs_to_dict(self):
+        return dict(self._attrs)
+
+
+class Group(AttrMixin):
+    __slots__ = (
+        "aris_id",
+        "guid",
+        "name",
+        "level",
+        "path",
+        "parent",
+        "groups",
+        "obj_defs",
+        "models",
+        "_attrs",
+    )
+    aris_type = "Group"
+
+    def __init__(self, group):
+        self.aris_id = group["aris_id"]
+        self.guid = group["guid"]
+        self.name = group["name"]
+        self.level = group["level"]
+        self.path = group["path"]
+        self.parent = None
+        self.groups = []
+        self.obj_defs = []
+        self.models = []
+        self._attrs = group.get("attrs", {})
+
+    def __repr__(self) -> str:
+        return f"Group(aris_id={self.aris_id!r}, name={self.name!r})"
+
+    @property
+    def hasChildren(self) -> bool:
+        """
+        Returns True if this Group has any groups or models as children.
+        """
+        return (len(self.models) + len(self.groups)) > 0
+
+
+class CxnDef(AttrMixin):
+    __slots__ = ("aris_id", "guid", "type", "obj_def", "connected_to", "occs", "_attrs")
+    aris_type = "CxnDef"
+
+    def __init__(self, cxn_def):
+        self.aris_id = cxn_def["aris_id"]
+        self.guid = cxn_def["guid"]
+        self.type = cxn_def["type"]
+        self.obj_def = None
+        self.connected_to = None
+        self.occs = []
+        self._attrs = cxn_def.get("attrs", {})
+
+    def __repr__(self) -> str:
+        return f"CxnDef(aris_id={self.aris_id!r}, type={self.type!r})"
+
+
+class ObjDef(AttrMixin):
+    __slots__ = (
+        "aris_id",
+        "guid",
+        "name",
+        "type",
+        "symbol",
+        "path",
+        "parent",
+        "linked_models",
+        "cxns",
+        "in_cxns",
+        "occs",
+        "_attrs",
+    )
+    aris_type = "ObjDef"
+
+    def __init__(self, obj_def, parent):
+        self.aris_id = obj_def["aris_id"]
+        self.guid = obj_def["guid"]
+        self.name = obj_def["name"]
+        self.type = obj_def["type"]
+        self.symbol = obj_def["symbol"]
+        self.path = obj_def["path"]
+        self.parent = parent
+        self.linked_models = []
+        self.cxns = []
+        self.in_cxns = []
+        self.occs = []
+        self._attrs = obj_def.get("attrs", {})
+
+    def __repr__(self) -> str:
+        return f"ObjDef(aris_id={self.aris_id!r}, name={self.name!r})"
+
+
+class Model(AttrMixin):
+    __slots__ = (
+        "aris_id",
+        "guid",
+        "name",
+        "type",
+        "path",
+        "superior_def",
+        "parent",
+        "occs",
+        "_attrs",
+    )
+    aris_type = "Model"
+
+    def __init__(self, model, parent):
+        self.aris_id = model["aris_id"]
+        self.guid = model["guid"]
+        self.name = model["name"]
+        self.type = model["type"]
+        self.path = model["path"]
+        self.superior_def = None
+        self.parent = parent
+        self.occs = []
+        self._attrs = model.get("attrs", {})
+
+    def __repr__(self) -> str:
+        return f"Model(aris_id={self.aris_id!r}, name={self.name!r})"
+
+
+class CxnOcc:
+    __slots__ = ("aris_id", "cxn_def", "obj_occ", "connected_to")
+    aris_type = "CxnOcc"
+
+    def __init__(self, cxn_occ, cxn_def):
+        self.aris_id = cxn_occ["aris_id"]
+        self.cxn_def = cxn_def
+        self.obj_occ = None
+        self.connected_to = None
+
+    def __repr__(self) -> str:
+        return f"CxnOcc(aris_id={self.aris_id!r}, type={self.type!r})"
+
+    @property
+    def type(self) -> str:
+        """
+        Returns the type of the occurance from the connection definition.
+        """
+        return self.cxn_def.type
+
+
+class ObjOcc:
+    __slots__ = (
+        "aris_id",
+        "symbol",
+        "derived_symbol",
+        "x",
+        "y",
+        "width",
+        "height",
+        "obj_def",
+        "model",
+        "cxns",
+        "in_cxns",
+    )
+    aris_type = "ObjOcc"
+
+    def __init__(self, obj_occ, obj_def, model):
+        self.aris_id = obj_occ["aris_id"]
+        self.symbol = obj_occ["symbol"]
+        self.derived_symbol = obj_occ.get("derived_symbol")
+        self.x = obj_occ["x"]
+        self.y = obj_occ["y"]
+        self.width = obj_occ["width"]
+        self.height = obj_occ["height"]
+        self.obj_def = obj_def
+        self.model = model
+        self.cxns = []
+        self.in_cxns = []
+
+    def __repr__(self) -> str:
+        return f"ObjOcc(aris_id={self.aris_id!r}, symbol={self.symbol!r})"
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name of the occurance from the object definition.
+        """
+        return self.obj_def.name
+
+
+class MemoryDatabase:
+    """
+    AMLParser data turned into linked objects, with the same navigation
+    attributes as the SQLModel classes plus the reverse connection edges
+    (in_cxns) of definitions and occurances. Objects are keyed by aris_id.
+    """
+
+    def __init__(self, data):
+        self.groups = {}
+        self.cxn_defs = {}
+        self.obj_defs = {}
+        self.models = {}
+        self.cxn_occs = {}
+        self.obj_occs = {}
+
+        for group_id, group in data["groups"].items():
+            self.groups[group_id] = Group(group)
+
+        for group_id, group in data["groups"].items():
+            parent = self.groups.get(group["parent"])
+            if parent is not None:
+                self.groups[group_id].parent = parent
+                parent.groups.append(self.groups[group_id])
+
+        for cxn_def_id, cxn_def in data["cxn_defs"].items():
+            self.cxn_defs[cxn_def_id] = CxnDef(cxn_def)
+
+        for obj_def_id, obj_def in data["obj_defs"].items():
+            parent = self.groups[obj_def["parent"]]
+            db_obj_def = ObjDef(obj_def, parent)
+            parent.obj_defs.append(db_obj_def)
+
+            for cxn_id in obj_def.get("cxns", []):
+                self.cxn_defs[cxn_id].obj_def = db_obj_def
+                db_obj_def.cxns.append(self.cxn_defs[cxn_id])
+
+            self.obj_defs[obj_def_id] = db_obj_def
+
+        for cxn_def_id, cxn_def in data["cxn_defs"].items():
+            connected_to = cxn_def.get("connected_to")
+            if connected_to:
+                self.cxn_defs[cxn_def_id].connected_to = self.obj_defs[connected_to]
+                self.obj_defs[connected_to].in_cxns.append(self.cxn_defs[cxn_def_id])
+
+        for model_id, model in data["models"].items():
+            parent = self.groups[model["parent"]]
+            self.models[model_id] = Model(model, parent)
+            parent.models.append(self.models[model_id])
+
+        for obj_def_id, model_ids in data["def_to_models"].items():
+            db_obj_def = self.obj_defs[obj_def_id]
+            for model_id in model_ids:
+                self.models[model_id].superior_def = db_obj_def
+                db_obj_def.linked_models.append(self.models[model_id])
+
+        for cxn_occ_id, cxn_occ in data["cxn_occs"].items():
+            cxn_def = self.cxn_defs[cxn_occ["cxn_def"]]
+            self.cxn_occs[cxn_occ_id] = CxnOcc(cxn_occ, cxn_def)
+            cxn_def.occs.append(self.cxn_occs[cxn_occ_id])
+
+        for obj_occ_id, obj_occ in data["obj_occs"].items():
+            obj_def = self.obj_defs[obj_occ["obj_def"]]
+            model = self.models[obj_occ["model_id"]]
+            db_obj_occ = ObjOcc(obj_occ, obj_def, model)
+            obj_def.occs.append(db_obj_occ)
+
+            for cxn_id in obj_occ.get("cxns", []):
+                self.cxn_occs[cxn_id].obj_occ = db_obj_occ
+                db_obj_occ.cxns.append(self.cxn_occs[cxn_id])
+
+            self.obj_occs[obj_occ_id] = db_obj_occ
+
+        for model_id, model in data["models"].items():
+            self.models[model_id].occs = [
+                self.obj_occs[occ_id] for occ_id in model.get("occs", [])
+            ]
+
+        for cxn_occ_id, cxn_occ in data["cxn_occs"].items():
+            connected_to = cxn_occ.get("connected_to")
+            if connected_to:
+                db_cxn_occ = self.cxn_occs[cxn_occ_id]
+                db_cxn_occ.connected_to = self.obj_occs[connected_to]
+                self.obj_occs[connected_to].in_cxns.append(db_cxn_occ)
+
+    def stats(self) -> dict:
+        """
+        Same categories as the Stat table of a SQLite database.
+        """
+
+        return {
+            "totals": {
+                "groups": len(self.groups),
+                "cxn_defs": len(self.cxn_defs),
+                "obj_defs": len(self.obj_defs),
+                "cxn_occs": len(self.cxn_occs),
+                "obj_occ": len(self.obj_occs),
+                "models": len(self.models),
+            },
+            "model_types": dict(Counter(m.type for m in self.models.values())),
+            "occ_symbols": dict(Counter(o.symbol for o in self.obj_occs.values())),
+            "cxn_types": dict(Counter(c.type for c in self.cxn_defs.values())),
+            "occs_per_model": {
+                model.aris_id: len(model.occs) for model in self.models.values()
+            },
+        }
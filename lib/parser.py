@@ -1,17 +1,103 @@
+import gzip
+import io
 import os.path
 import re
+import zipfile
+from contextlib import ExitStack, contextmanager
+from sys import intern
 
 import lxml.etree as ET
 
 from lib.db_utilities import create_database
 
+READ_BUFFER_SIZE = 16 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def get_sqlite_filename(aml_filename):
+    """
+    Database filename for an AML export, ignoring any compression extension,
+    e.g. "export.xml.gz" -> "export.db".
+    """
+
+    root, ext = os.path.splitext(aml_filename)
+    if ext.lower() in (".gz", ".zip"):
+        inner_root, inner_ext = os.path.splitext(root)
+        if inner_ext.lower() in (".xml", ".aml"):
+            root = inner_root
+
+    return f"{root}.db"
+
+
+def find_aml_member(archive):
+    """
+    Return the largest XML member of a zip archive, which is the AML export.
+    """
+
+    members = [
+        info
+        for info in archive.infolist()
+        if not info.is_dir() and info.filename.lower().endswith((".xml", ".aml"))
+    ]
+    if not members:
+        raise SystemExit("Error: No AML file found in zip archive.")
+
+    return max(members, key=lambda info: info.file_size)
+
+
+@contextmanager
+def open_aml(aml_file):
+    """
+    Yield a source for iterparse. Plain XML files are passed through by name so
+    lxml can read them natively; gzip and zip files (or file-like objects) are
+    decompressed on the fly behind a large read buffer.
+    """
+
+    with ExitStack() as stack:
+        if isinstance(aml_file, (str, os.PathLike)):
+            with open(aml_file, "rb") as stream:
+                compressed = stream.peek(4).startswith((GZIP_MAGIC, ZIP_MAGIC))
+
+            if not compressed:
+                yield aml_file
+                return
+
+            stream = stack.enter_context(
+                open(aml_file, "rb", buffering=READ_BUFFER_SIZE)
+            )
+        elif not hasattr(aml_file, "peek"):
+            # Sniffing needs peek; detach afterwards so the caller's stream
+            # isn't closed along with the wrapper
+            stream = io.BufferedReader(aml_file, READ_BUFFER_SIZE)
+            stack.callback(stream.detach)
+        else:
+            stream = aml_file
+
+        magic = stream.peek(4)[:4]
+
+        if magic.startswith(GZIP_MAGIC):
+            source = stack.enter_context(gzip.GzipFile(fileobj=stream))
+        elif magic.startswith(ZIP_MAGIC):
+            if not stream.seekable():
+                raise SystemExit("Error: Zip archives need a seekable stream.")
+
+            archive = stack.enter_context(zipfile.ZipFile(stream))
+            source = stack.enter_context(archive.open(find_aml_member(archive)))
+        else:
+            yield stream
+            return
+
+        yield io.BufferedReader(source, READ_BUFFER_SIZE)
+
 
 class AMLParser:
     """
     Parse Aris XML and store data in a SQLite database
     """
 
-    def __init__(self, aml_filename):
+    def __init__(self, aml_file, sqlite_filename=None, in_memory=False):
         self.data = {
             "groups": {},
             "cxn_defs": {},
@@ -23,15 +109,31 @@ class AMLParser:
         }
 
         self.path = []
-        self.parse_aml(aml_filename)
+        self.parse_aml(aml_file, sqlite_filename, in_memory)
+
+    def parse_aml(self, aml_file, sqlite_filename=None, in_memory=False):
+        """
+        Parse an AML export given as a filename or binary file-like object,
+        either plain XML, gzip or zip compressed. The database is named after
+        the export unless sqlite_filename is given. With in_memory no database
+        is created and only self.data is filled.
+        """
+
+        aml_filename = getattr(aml_file, "name", aml_file)
+        if sqlite_filename is None and not in_memory:
+            if not isinstance(aml_filename, (str, os.PathLike)):
+                raise SystemExit("Error: No database filename provided for stream.")
+            sqlite_filename = get_sqlite_filename(aml_filename)
 
-    def parse_aml(self, aml_filename):
         print(f"Parsing AML file '{aml_filename}' ...")
 
-        context = ET.iterparse(aml_filename, ("start", "end"))
-        self.low_memory_iter(context)
+        with open_aml(aml_file) as source:
+            context = ET.iterparse(source, ("start", "end"))
+            self.low_memory_iter(context)
+
+        if in_memory:
+            return
 
-        sqlite_filename = f"{os.path.splitext(aml_filename)[0]}.db"
         print(f"Creating SQLite Database '{sqlite_filename}' ...")
         create_database(self.data, sqlite_filename)
 
@@ -40,6 +142,7 @@ class AMLParser:
 
         attr_defs = item.findall("AttrDef")
         for attr in attr_defs:
+            attr_type = intern(attr.get("AttrDef.Type"))
             plain_text = attr.findall(".//PlainText")
 
             attr_text = " ".join(
@@ -47,13 +150,13 @@ class AMLParser:
             )
 
             if attr_text:
-                attrs[attr.get("AttrDef.Type")] = attr_text.strip()
+                attrs[attr_type] = attr_text.strip()
             else:
                 attr_value = attr.find(".//AttrValue")
                 if attr_value is not None and attr_value.text is not None:
-                    attrs[attr.get("AttrDef.Type")] = attr_value.text.strip()
+                    attrs[attr_type] = attr_value.text.strip()
                 else:
-                    attrs[attr.get("AttrDef.Type")] = ""
+                    attrs[attr_type] = ""
 
         name = None
         if "AT_NAME" in attrs:
@@ -100,10 +203,10 @@ class AMLParser:
             }
 
             if symbol_GUID is not None:
-                new_values["symbol"] = symbol_GUID.text
-                new_values["derived_symbol"] = occ.get("SymbolNum", "")
+                new_values["symbol"] = intern(symbol_GUID.text)
+                new_values["derived_symbol"] = intern(occ.get("SymbolNum", ""))
             else:
-                new_values["symbol"] = occ.get("SymbolNum", "")
+                new_values["symbol"] = intern(occ.get("SymbolNum", ""))
 
             occs.setdefault(id, {}).update(new_values)
 
@@ -122,7 +225,7 @@ class AMLParser:
             obj_cxns[id] = {
                 "aris_id": id,
                 "guid": cxn.find("GUID").text,
-                "type": cxn.get("CxnDef.Type"),
+                "type": intern(cxn.get("CxnDef.Type")),
                 "connected_to": cxn.get("ToObjDef.IdRef"),
                 "attrs": attrs,
             }
@@ -146,8 +249,8 @@ class AMLParser:
                 "parent": obj.getparent().get("Group.ID"),
                 "guid": obj.find("GUID").text,
                 "name": name,
-                "type": obj.get("TypeNum", ""),
-                "symbol": obj.get("SymbolNum", ""),
+                "type": intern(obj.get("TypeNum", "")),
+                "symbol": intern(obj.get("SymbolNum", "")),
                 "linked_models": linked_models,
                 "cxns": list(def_cxns.keys()),
                 "attrs": attrs,
@@ -169,7 +272,7 @@ class AMLParser:
                 "parent": model.getparent().get("Group.ID"),
                 "guid": model.find("GUID").text,
                 "name": name,
-                "type": model.get("Model.Type"),
+                "type": intern(model.get("Model.Type")),
                 "occs": self.parse_obj_occs(model),
                 "attrs": attrs,
                 "path": "/".join(self.path),